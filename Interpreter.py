@@ -1,6 +1,11 @@
+import operator
 import re
+from collections import namedtuple
+
 
 class Token:
+    __slots__ = ('type', 'value')
+
     def __init__(self, type_, value=None):
         self.type = type_
         self.value = value
@@ -9,135 +14,118 @@ class Token:
         return f'Token({self.type}, {repr(self.value)})'
 
 
+# Operator lexemes, one or two characters long, mapped to their token types
+OPERATORS = {
+    '==': 'EQ', '!=': 'NE', '<=': 'LE', '>=': 'GE',
+    '=': 'EQUALS', '<': 'LT', '>': 'GT',
+    '+': 'PLUS', '-': 'MINUS', '*': 'MULTIPLY', '/': 'DIVIDE',
+    '(': 'LPAREN', ')': 'RPAREN', '{': 'LBRACE', '}': 'RBRACE',
+    ';': 'SEMI',
+}
+
+# One alternation for the whole token grammar. Keywords (case-insensitive)
+# get their own groups ahead of IDENTIFIER, and the lookahead stops them from
+# matching a prefix such as the 'if' in 'iffy'. All operators share the OP
+# group, whose lexeme is looked up in OPERATORS; the two-character forms come
+# first so that e.g. '<=' is not read as '<' '='. Leading whitespace is
+# consumed as part of each match rather than surfacing as a token of its own;
+# END lets trailing whitespace match once instead of failing at every offset.
+TOKEN_RE = re.compile(r"""
+  \s*
+  (?:
+    (?P<NUMBER>\d+)
+  | (?P<IF>(?ai:if)(?![A-Za-z0-9_]))
+  | (?P<ELSE>(?ai:else)(?![A-Za-z0-9_]))
+  | (?P<WHILE>(?ai:while)(?![A-Za-z0-9_]))
+  | (?P<FOR>(?ai:for)(?![A-Za-z0-9_]))
+  | (?P<PRINT>(?ai:print)(?![A-Za-z0-9_]))
+  | (?P<IDENTIFIER>[A-Za-z_][A-Za-z0-9_]*)
+  | (?P<OP>[=!<>]=|[-+*/(){};=<>])
+  | (?P<MISMATCH>\S)
+  | (?P<END>\Z)
+  )
+""", re.VERBOSE)
+
+
 class Lexer:
     def __init__(self, text):
         self.text = text
-        self.pos = 0
-        self.current_char = self.text[self.pos] if self.text else None
-        self.keywords = {'if': 'IF', 'else': 'ELSE', 'while': 'WHILE', 'for': 'FOR', 'print': 'PRINT'}  # Store keywords as uppercase
+        self._iter = self.tokens()
 
     def error(self):
         raise Exception('Invalid character')
 
-    def advance(self):
-        self.pos += 1
-        if self.pos >= len(self.text):
-            self.current_char = None
-        else:
-            self.current_char = self.text[self.pos]
-
-    def peek(self):
-        peek_pos = self.pos + 1
-        if peek_pos >= len(self.text):
-            return None
-        return self.text[peek_pos]
-
-    def skip_whitespace(self):
-        while self.current_char is not None and self.current_char.isspace():
-            self.advance()
-
-    def id(self):
-        result = ''
-        while self.current_char is not None and re.match(r'[a-zA-Z_]', self.current_char):
-            result += self.current_char
-            self.advance()
-        token_type = self.keywords.get(result.lower())  # Case-insensitive keyword check
-        if token_type:
-            return Token(token_type)
-        return Token('IDENTIFIER', result)
-
-    def number(self):
-        result = ''
-        while self.current_char is not None and self.current_char.isdigit():
-            result += self.current_char
-            self.advance()
-        return Token('NUMBER', int(result))
+    def tokens(self):
+        for m in TOKEN_RE.finditer(self.text):
+            kind = m.lastgroup
+            if kind == 'OP':
+                yield Token(OPERATORS[m.group(kind)])
+            elif kind == 'IDENTIFIER':
+                yield Token('IDENTIFIER', m.group(kind))
+            elif kind == 'NUMBER':
+                yield Token('NUMBER', int(m.group(kind)))
+            elif kind == 'MISMATCH':
+                self.error()
+            elif kind == 'END':
+                return
+            else:
+                # The group name of a keyword match is its token type
+                yield Token(kind)
 
     def get_next_token(self):
-        while self.current_char is not None:
-            if self.current_char.isspace():
-                self.skip_whitespace()
-                continue
-
-            if self.current_char.isalpha():
-                return self.id()
-
-            if self.current_char.isdigit():
-                return self.number()
-
-            # Multi-character operators
-            if self.current_char == '=' and self.peek() == '=':
-                self.advance()
-                self.advance()
-                return Token('EQ')
-            if self.current_char == '!' and self.peek() == '=':
-                self.advance()
-                self.advance()
-                return Token('NE')
-            if self.current_char == '<' and self.peek() == '=':
-                self.advance()
-                self.advance()
-                return Token('LE')
-            if self.current_char == '>' and self.peek() == '=':
-                self.advance()
-                self.advance()
-                return Token('GE')
-
-            # Single-character operators
-            if self.current_char == '=':
-                self.advance()
-                return Token('EQUALS')
-            if self.current_char == '<':
-                self.advance()
-                return Token('LT')
-            if self.current_char == '>':
-                self.advance()
-                return Token('GT')
-            if self.current_char == '+':
-                self.advance()
-                return Token('PLUS')
-            if self.current_char == '-':
-                self.advance()
-                return Token('MINUS')
-            if self.current_char == '*':
-                self.advance()
-                return Token('MULTIPLY')
-            if self.current_char == '/':
-                self.advance()
-                return Token('DIVIDE')
-            if self.current_char == '(':
-                self.advance()
-                return Token('LPAREN')
-            if self.current_char == ')':
-                self.advance()
-                return Token('RPAREN')
-            if self.current_char == '{':
-                self.advance()
-                return Token('LBRACE')
-            if self.current_char == '}':
-                self.advance()
-                return Token('RBRACE')
-            if self.current_char == ';':
-                self.advance()
-                return Token('SEMI')
-
-            self.error()
-
-        return Token('EOF')
-
+        return next(self._iter, Token('EOF'))
+
+
+# Binary operator token types mapped to the functions that evaluate them
+BINOPS = {
+    'PLUS': operator.add,
+    'MINUS': operator.sub,
+    'MULTIPLY': operator.mul,
+    'DIVIDE': operator.truediv,
+    'EQ': operator.eq,
+    'NE': operator.ne,
+    'LT': operator.lt,
+    'GT': operator.gt,
+    'LE': operator.le,
+    'GE': operator.ge,
+}
+
+
+# AST nodes
+Number = namedtuple('Number', 'value')
+Identifier = namedtuple('Identifier', 'name')
+BinOp = namedtuple('BinOp', 'op op_fn left right')
+UnaryOp = namedtuple('UnaryOp', 'op expr')
+Assign = namedtuple('Assign', 'var_name value')
+Print = namedtuple('Print', 'expr')
+If = namedtuple('If', 'condition body else_body')
+While = namedtuple('While', 'condition body')
+For = namedtuple('For', 'init condition update body')
 
 
 class Parser:
     def __init__(self, lexer):
         self.lexer = lexer
-        self.current_token = self.lexer.get_next_token()
+        # Run the lexer to completion up front; the parser then only indexes into the list
+        self.tokens = list(self._lex_all(lexer))
+        self.idx = 0
+        self.current_token = self.tokens[0]
+
+    @staticmethod
+    def _lex_all(lexer):
+        token = lexer.get_next_token()
+        while token.type != 'EOF':
+            yield token
+            token = lexer.get_next_token()
+        yield token
 
     def error(self, message="Invalid syntax"):  # Added a default message
         raise Exception(message)
 
     def eat(self, token_type):
         if self.current_token.type == token_type:
-            self.current_token = self.lexer.get_next_token()
+            self.idx += 1
+            self.current_token = self.tokens[self.idx]
         else:
             self.error(f"Expected {token_type}, but got {self.current_token.type}")  # Provide more context
 
@@ -175,7 +163,7 @@ class Parser:
             self.eat('LBRACE')
             else_body = self.statements()
             self.eat('RBRACE')
-        return {'type': 'IF', 'condition': condition, 'body': body, 'else_body': else_body}
+        return If(condition, body, else_body)
 
     def while_stmt(self):
         self.eat('WHILE')
@@ -185,7 +173,7 @@ class Parser:
         self.eat('LBRACE')
         body = self.statements()
         self.eat('RBRACE')
-        return {'type': 'WHILE', 'condition': condition, 'body': body}
+        return While(condition, body)
 
     def for_stmt(self):
         self.eat('FOR')
@@ -198,7 +186,7 @@ class Parser:
         self.eat('LBRACE')
         body = self.statements()
         self.eat('RBRACE')
-        return {'type': 'FOR', 'init': init, 'condition': condition, 'update': update, 'body': body}
+        return For(init, condition, update, body)
 
     def assign_stmt(self):
         var_name = self.current_token.value
@@ -206,7 +194,7 @@ class Parser:
         self.eat('EQUALS')
         value = self.expression()
         self.eat('SEMI')
-        return {'type': 'ASSIGN', 'var_name': var_name, 'value': value}
+        return Assign(var_name, value)
 
     def print_stmt(self):
         self.eat('PRINT')
@@ -214,7 +202,7 @@ class Parser:
         expr = self.expression()
         self.eat('RPAREN')
         self.eat('SEMI')
-        return {'type': 'PRINT', 'expr': expr}
+        return Print(expr)
 
     def statements(self):
         stmts = []
@@ -232,7 +220,7 @@ class Parser:
             op = self.current_token
             self.eat(op.type)
             right = self.arithmetic()
-            left = {'type': 'BINOP', 'left': left, 'op': op, 'right': right}
+            left = BinOp(op, BINOPS[op.type], left, right)
         return left
 
     def arithmetic(self):
@@ -241,7 +229,7 @@ class Parser:
             op = self.current_token
             self.eat(op.type)
             right = self.term()
-            left = {'type': 'BINOP', 'left': left, 'op': op, 'right': right}
+            left = BinOp(op, BINOPS[op.type], left, right)
         return left
 
     def term(self):
@@ -250,17 +238,17 @@ class Parser:
             op = self.current_token
             self.eat(op.type)
             right = self.factor()
-            left = {'type': 'BINOP', 'left': left, 'op': op, 'right': right}
+            left = BinOp(op, BINOPS[op.type], left, right)
         return left
 
     def factor(self):
         token = self.current_token
         if token.type == 'NUMBER':
             self.eat('NUMBER')
-            return {'type': 'NUMBER', 'value': token.value}
+            return Number(token.value)
         elif token.type == 'IDENTIFIER':
             self.eat('IDENTIFIER')
-            return {'type': 'IDENTIFIER', 'value': token.value}
+            return Identifier(token.value)
         elif token.type == 'LPAREN':
             self.eat('LPAREN')
             expr = self.expression()
@@ -268,10 +256,16 @@ class Parser:
             return expr
         elif token.type == 'MINUS': #handle unary minus
             self.eat('MINUS')
-            return {'type': 'UNARYOP', 'op': 'MINUS', 'expr': self.factor()} #factor handles the next operand
+            operand = self.factor() #factor handles the next operand
+            if type(operand) is Number: # fold the sign into literals at parse time
+                return Number(-operand.value)
+            return UnaryOp('MINUS', operand)
         elif token.type == 'PLUS': #handle unary plus.
             self.eat('PLUS')
-            return {'type': 'UNARYOP', 'op': 'PLUS', 'expr': self.factor()}
+            operand = self.factor()
+            if type(operand) is Number:
+                return operand
+            return UnaryOp('PLUS', operand)
         else:
             self.error("Invalid factor") # Improved error message
 
@@ -279,103 +273,163 @@ import re
 
 # ... (Token, Lexer, Parser classes unchanged)
 
+# Marks a frame slot whose variable has not been assigned yet
+_UNDEFINED = object()
+
+
 class Interpreter:
     def __init__(self, parser, global_scope=None):
         self.parser = parser
-        self.global_scope = global_scope if global_scope is not None else {}
+        # Variables live in a flat list; each name is resolved to its index at compile time
+        self.slots = {}
+        self.frame = []
+        for var_name, value in (global_scope or {}).items():
+            self.frame[self._slot(var_name)] = value
+        self._dispatch = {
+            If: self.compile_if,
+            While: self.compile_while,
+            For: self.compile_for,
+            Assign: self.compile_assign,
+            Print: self.compile_print,
+            BinOp: self.compile_binop,
+            UnaryOp: self.compile_unaryop,
+            Number: self.compile_number,
+            Identifier: self.compile_identifier,
+        }
+
+    @property
+    def global_scope(self):
+        frame = self.frame
+        return {name: frame[i] for name, i in self.slots.items() if frame[i] is not _UNDEFINED}
+
+    def _reader(self, var_name):
+        """Return a callable that reads var_name's slot, raising NameError while it is unassigned."""
+        frame = self.frame
+        slot = self._slot(var_name)
+
+        def read():
+            value = frame[slot]
+            if value is _UNDEFINED:
+                raise NameError(f"Variable '{var_name}' is not defined")
+            return value
+        return read
+
+    def _slot(self, var_name):
+        slot = self.slots.get(var_name)
+        if slot is None:
+            slot = self.slots[var_name] = len(self.frame)
+            self.frame.append(_UNDEFINED)
+        return slot
 
     def interpret(self):
         tree = self.parser.parse()
-        for stmt in tree:
-            self.visit(stmt)
-
-    def visit(self, node):
-        if not node:
-            return None
-        method_name = f'visit_{node["type"].lower()}'
-        method = getattr(self, method_name, self.generic_visit)
+        try:
+            for run in [self.compile(stmt) for stmt in tree]:
+                run()
+        except ZeroDivisionError:
+            # Divisions don't check for zero themselves; reword Python's error once here
+            raise ZeroDivisionError("Division by zero") from None
+
+    def compile(self, node):
+        """Turn node into a zero-argument callable that evaluates or executes it."""
+        method = self._dispatch.get(type(node), self.generic_compile)
         return method(node)
 
-    def generic_visit(self, node):
-        raise Exception(f'No visit_{node["type"].lower()} method for {node}')
-
-    def visit_if(self, node):
-        condition_value = self.visit(node['condition'])
-        if condition_value:
-            for stmt in node['body']:
-                self.visit(stmt)
-        elif node['else_body']:
-            for stmt in node['else_body']:
-                self.visit(stmt)
-
-    def visit_while(self, node):
-        while self.visit(node['condition']):
-            for stmt in node['body']:
-                self.visit(stmt)
-
-    def visit_for(self, node):
-        self.visit(node['init'])
-        while self.visit(node['condition']):
-            for stmt in node['body']:
-                self.visit(stmt)
-            self.visit(node['update'])
-
-    def visit_assign(self, node):
-        var_name = node['var_name']
-        value = self.visit(node['value'])
-        self.global_scope[var_name] = value
-
-    def visit_print(self, node):
-        value = self.visit(node['expr'])
-        print(value)
-
-    def visit_binop(self, node):
-        left = self.visit(node['left'])
-        right = self.visit(node['right'])
-        op_type = node['op'].type
-        if op_type == 'PLUS':
-            return left + right
-        elif op_type == 'MINUS':
-            return left - right
-        elif op_type == 'MULTIPLY':
-            return left * right
-        elif op_type == 'DIVIDE':
-            if right == 0:
-                raise ZeroDivisionError("Division by zero")
-            return left / right
-        elif op_type == 'EQ':
-            return left == right
-        elif op_type == 'NE':
-            return left != right
-        elif op_type == 'LT':
-            return left < right
-        elif op_type == 'GT':
-            return left > right
-        elif op_type == 'LE':
-            return left <= right
-        elif op_type == 'GE':
-            return left >= right
-        else:
-            raise Exception(f"Unsupported binary operator: {op_type}")
-
-    def visit_unaryop(self, node):
-        expr_value = self.visit(node['expr'])
-        if node['op'] == 'MINUS':
-            return -expr_value
-        elif node['op'] == 'PLUS':
-            return +expr_value
+    def generic_compile(self, node):
+        raise Exception(f'No compile_{type(node).__name__.lower()} method for {node}')
+
+    def compile_block(self, stmts):
+        """Compile a statement list into a single callable, so loops make one call per iteration."""
+        fns = [self.compile(stmt) for stmt in stmts]
+        if not fns:
+            return lambda: None
+        if len(fns) == 1:
+            return fns[0]
+
+        def run():
+            for fn in fns:
+                fn()
+        return run
+
+    def compile_if(self, node):
+        cond = self.compile(node.condition)
+        body = self.compile_block(node.body)
+        else_body = self.compile_block(node.else_body or ())
+
+        def run():
+            if cond():
+                body()
+            else:
+                else_body()
+        return run
+
+    def compile_while(self, node):
+        cond = self.compile(node.condition)
+        body = self.compile_block(node.body)
+
+        def run():
+            while cond():
+                body()
+        return run
+
+    def compile_for(self, node):
+        init = self.compile(node.init)
+        cond = self.compile(node.condition)
+        # The update runs after the body on every iteration, so fold it into the same block
+        step = self.compile_block(node.body + [node.update])
+
+        def run():
+            init()
+            while cond():
+                step()
+        return run
+
+    def compile_assign(self, node):
+        frame = self.frame
+        slot = self._slot(node.var_name)
+        value = self.compile(node.value)
+
+        def run():
+            frame[slot] = value()
+        return run
+
+    def compile_print(self, node):
+        expr = self.compile(node.expr)
+        return lambda: print(expr())
+
+    def compile_binop(self, node):
+        # Literal operands are bound directly rather than through their own
+        # closures, flattening the commonest shapes (i < 10, i + 1) into
+        # fewer calls per evaluation.
+        op_fn = node.op_fn
+        left_node, right_node = node.left, node.right
+        if type(right_node) is Number:
+            left = self.compile(left_node)
+            right_value = right_node.value
+            return lambda: op_fn(left(), right_value)
+        if type(left_node) is Number:
+            left_value = left_node.value
+            right = self.compile(right_node)
+            return lambda: op_fn(left_value, right())
+        left = self.compile(left_node)
+        right = self.compile(right_node)
+        return lambda: op_fn(left(), right())
+
+    def compile_unaryop(self, node):
+        expr = self.compile(node.expr)
+        if node.op == 'MINUS':
+            return lambda: -expr()
+        elif node.op == 'PLUS':
+            return lambda: +expr()
         else:
-            raise Exception(f"Unsupported unary operator: {node['op']}")
+            raise Exception(f"Unsupported unary operator: {node.op}")
 
-    def visit_number(self, node):
-        return node['value']
+    def compile_number(self, node):
+        value = node.value
+        return lambda: value
 
-    def visit_identifier(self, node):
-        var_name = node['value']
-        if var_name in self.global_scope:
-            return self.global_scope[var_name]
-        else:
-            raise NameError(f"Variable '{var_name}' is not defined")
+    def compile_identifier(self, node):
+        return self._reader(node.name)
 
 # Main REPL loop with persistent global_scope
 def main():
@@ -386,12 +440,13 @@ def main():
             open_braces = 0
             while True:
                 text = input("? ")
-                if text.strip().lower() == "exit":
+                stripped = text.strip()
+                if stripped.lower() == "exit":
                     return
                 lines.append(text)
                 open_braces += text.count('{') - text.count('}')
                 # If all opened braces are closed, break (or if no braces were used)
-                if open_braces <= 0 and (not lines[-1].strip() or lines[-1].strip().endswith(';') or lines[-1].strip() == '}'):
+                if open_braces <= 0 and (not stripped or stripped.endswith(';') or stripped == '}'):
                     break
             code = '\n'.join(lines)
             if not code.strip():
@@ -399,8 +454,11 @@ def main():
             lexer = Lexer(code)
             parser = Parser(lexer)
             interpreter = Interpreter(parser, global_scope)
-            interpreter.interpret()
-            global_scope = interpreter.global_scope
+            try:
+                interpreter.interpret()
+            finally:
+                # Keep assignments made before a runtime error
+                global_scope = interpreter.global_scope
         except Exception as e:
             print(f"Error: {e}")
 